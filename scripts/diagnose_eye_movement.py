@@ -5,13 +5,49 @@ This tool shows you in real-time how much your eyes are actually moving
 according to the camera detection.
 """
 
+import argparse
+import math
 import cv2
 import mediapipe as mp
 import numpy as np
-from collections import deque
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _eye_relpos(eye_pts, iris_pts):
+    """Compute (horizontal, vertical) iris ratio from float32 (6,2)/(5,2) point arrays."""
+    iris_cx = 0.0
+    iris_cy = 0.0
+    for i in range(iris_pts.shape[0]):
+        iris_cx += iris_pts[i, 0]
+        iris_cy += iris_pts[i, 1]
+    iris_cx /= iris_pts.shape[0]
+    iris_cy /= iris_pts.shape[0]
+
+    top_y = 0.5 * (eye_pts[1, 1] + eye_pts[2, 1])
+    bot_x = 0.5 * (eye_pts[4, 0] + eye_pts[5, 0])
+    bot_y = 0.5 * (eye_pts[4, 1] + eye_pts[5, 1])
+    top_x = 0.5 * (eye_pts[1, 0] + eye_pts[2, 0])
+
+    eye_width = math.sqrt((eye_pts[3, 0] - eye_pts[0, 0]) ** 2 +
+                          (eye_pts[3, 1] - eye_pts[0, 1]) ** 2)
+    eye_height = math.sqrt((bot_x - top_x) ** 2 + (bot_y - top_y) ** 2)
+
+    horizontal = (iris_cx - eye_pts[0, 0]) / (eye_width + 1e-6)
+    vertical = (iris_cy - top_y) / (eye_height + 1e-6)
+
+    return min(max(horizontal, 0.0), 1.0), min(max(vertical, 0.0), 1.0)
+
+
+if njit is not None:
+    _eye_relpos = njit(cache=True, fastmath=True)(_eye_relpos)
+
 
 class EyeMovementDiagnostic:
-    def __init__(self):
+    def __init__(self, use_camera=True):
         self.mp_face_mesh = mp.solutions.face_mesh
         self.face_mesh = self.mp_face_mesh.FaceMesh(
             max_num_faces=1,
@@ -19,56 +55,92 @@ class EyeMovementDiagnostic:
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
-        
+
         # Iris indices
         self.LEFT_IRIS = [474, 475, 476, 477, 478]
         self.RIGHT_IRIS = [469, 470, 471, 472, 473]
         self.LEFT_EYE = [33, 133, 160, 159, 158, 144]
         self.RIGHT_EYE = [362, 263, 387, 386, 385, 380]
+
+        # Warm up the JIT so compilation cost is paid here, not mid-stream
+        _eye_relpos(np.zeros((6, 2), np.float32), np.zeros((5, 2), np.float32))
+
+        self.cap = None
+        self.frame_width = 640
+        self.frame_height = 480
+        if use_camera:
+            self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+            if not self.cap.isOpened():
+                self.cap = cv2.VideoCapture(0)
+
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+
+            self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-        if not self.cap.isOpened():
-            self.cap = cv2.VideoCapture(0)
-        
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        
-        self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        
-        # Track min/max eye positions
-        self.eye_x_min = 1.0
-        self.eye_x_max = 0.0
-        self.eye_y_min = 1.0
-        self.eye_y_max = 0.0
+        # Track min/max eye positions as (x, y) accumulators
+        self._rng_min = np.array([1.0, 1.0], dtype=np.float32)
+        self._rng_max = np.array([0.0, 0.0], dtype=np.float32)
         
-        # History for visualization
-        self.history_x = deque(maxlen=100)
-        self.history_y = deque(maxlen=100)
-    
+        # History for visualization - fixed (x, y) ring buffer
+        self._hist = np.zeros((100, 2), dtype=np.float32)
+        self._hist_pos = 0
+        self._hist_cnt = 0
+
+        # Pre-rendered static background (grid + center lines) - copied each frame
+        self._bg = np.zeros((600, 800, 3), dtype=np.uint8)
+        for i in range(0, 800, 100):
+            cv2.line(self._bg, (i, 0), (i, 600), (30, 30, 30), 1)
+        for i in range(0, 600, 100):
+            cv2.line(self._bg, (0, i), (800, i), (30, 30, 30), 1)
+        cv2.line(self._bg, (400, 0), (400, 600), (50, 50, 50), 2)
+        cv2.line(self._bg, (0, 300), (800, 300), (50, 50, 50), 2)
+
+        # Reused per-frame buffers (avoid ~1 MB of allocations per frame)
+        self._viz_buf = np.empty_like(self._bg)
+        self._rgb_buf = np.empty((self.frame_height, self.frame_width, 3), dtype=np.uint8)
+
+        # Motion gate: skip FaceMesh when the downsampled frame barely changed.
+        # Threshold = mean intensity delta of 2 over an 80x60 grayscale thumb.
+        self._prev_small = None
+        self._last_results = None
+        self._motion_threshold = 2 * 80 * 60
+
     def get_eye_relative_pos(self, landmarks, eye_indices, iris_indices):
         """Get eye position relative to eye boundaries."""
-        eye_points = np.array([[landmarks[i][0], landmarks[i][1]] for i in eye_indices])
-        iris_points = np.array([[landmarks[i][0], landmarks[i][1]] for i in iris_indices])
-        
-        iris_center_x = np.mean([p[0] for p in iris_points])
-        iris_center_y = np.mean([p[1] for p in iris_points])
-        
-        eye_left = eye_points[0]
-        eye_right = eye_points[3]
-        eye_top = np.mean([eye_points[1], eye_points[2]], axis=0)
-        eye_bottom = np.mean([eye_points[4], eye_points[5]], axis=0)
-        
-        eye_width = np.linalg.norm(eye_right - eye_left)
-        eye_height = np.linalg.norm(eye_bottom - eye_top)
-        
-        horizontal_ratio = (iris_center_x - eye_left[0]) / (eye_width + 1e-6)
-        vertical_ratio = (iris_center_y - eye_top[1]) / (eye_height + 1e-6)
-        
-        return float(np.clip(horizontal_ratio, 0.0, 1.0)), float(np.clip(vertical_ratio, 0.0, 1.0))
-    
-    def run(self):
-        """Run diagnostic tool."""
+        eye_points = np.asarray(landmarks, dtype=np.float32)[eye_indices]
+        iris_points = np.asarray(landmarks, dtype=np.float32)[iris_indices]
+
+        h, v = _eye_relpos(eye_points, iris_points)
+        return float(h), float(v)
+
+    @property
+    def eye_x_min(self):
+        return float(self._rng_min[0])
+
+    @property
+    def eye_x_max(self):
+        return float(self._rng_max[0])
+
+    @property
+    def eye_y_min(self):
+        return float(self._rng_min[1])
+
+    @property
+    def eye_y_max(self):
+        return float(self._rng_max[1])
+
+    def run(self, headless=False, max_frames=None):
+        """Run diagnostic tool.
+
+        With headless=True no window is created and no key polling happens -
+        useful for batch analysis. Stop via max_frames (defaults to 1000
+        frames when headless).
+        """
+        if headless and max_frames is None:
+            max_frames = 1000
+
         print("\n" + "="*80)
         print("EYE MOVEMENT RANGE DIAGNOSTIC")
         print("="*80)
@@ -87,20 +159,37 @@ class EyeMovementDiagnostic:
         print("  - Real-time values")
         print("\n" + "="*80 + "\n")
         
-        cv2.namedWindow("Eye Movement Diagnostic", cv2.WINDOW_NORMAL)
-        cv2.resizeWindow("Eye Movement Diagnostic", 800, 600)
-        
+        if not headless:
+            cv2.namedWindow("Eye Movement Diagnostic", cv2.WINDOW_NORMAL)
+            cv2.resizeWindow("Eye Movement Diagnostic", 800, 600)
+
+        frame_count = 0
         while True:
+            if max_frames is not None and frame_count >= max_frames:
+                break
             ret, frame = self.cap.read()
             if not ret:
                 break
+            frame_count += 1
             
             frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.face_mesh.process(rgb_frame)
-            
-            # Create visualization canvas
-            viz = np.zeros((600, 800, 3), dtype=np.uint8)
+
+            # Cheap motion gate: reuse last landmarks on near-identical frames
+            small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (80, 60))
+            if (self._prev_small is not None and self._last_results is not None
+                    and cv2.norm(small, self._prev_small, cv2.NORM_L1) < self._motion_threshold):
+                results = self._last_results
+            else:
+                if self._rgb_buf.shape != frame.shape:
+                    self._rgb_buf = np.empty_like(frame)
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+                results = self.face_mesh.process(self._rgb_buf)
+                self._last_results = results
+                self._prev_small = small
+
+            # Reset the visualization canvas to the pre-rendered background
+            viz = self._viz_buf
+            np.copyto(viz, self._bg)
             
             if results.multi_face_landmarks:
                 landmarks = np.array([
@@ -113,27 +202,16 @@ class EyeMovementDiagnostic:
                 
                 avg_x = (left_eye[0] + right_eye[0]) / 2
                 avg_y = (left_eye[1] + right_eye[1]) / 2
-                
-                # Update min/max
-                self.eye_x_min = min(self.eye_x_min, avg_x)
-                self.eye_x_max = max(self.eye_x_max, avg_x)
-                self.eye_y_min = min(self.eye_y_min, avg_y)
-                self.eye_y_max = max(self.eye_y_max, avg_y)
+
+                # Update min/max in one vector op per bound
+                avg = np.array([avg_x, avg_y], dtype=np.float32)
+                np.minimum(self._rng_min, avg, out=self._rng_min)
+                np.maximum(self._rng_max, avg, out=self._rng_max)
                 
                 # Add to history
-                self.history_x.append(avg_x)
-                self.history_y.append(avg_y)
-                
-                # Draw visualization
-                # Background grid
-                for i in range(0, 800, 100):
-                    cv2.line(viz, (i, 0), (i, 600), (30, 30, 30), 1)
-                for i in range(0, 600, 100):
-                    cv2.line(viz, (0, i), (800, i), (30, 30, 30), 1)
-                
-                # Center lines
-                cv2.line(viz, (400, 0), (400, 600), (50, 50, 50), 2)
-                cv2.line(viz, (0, 300), (800, 300), (50, 50, 50), 2)
+                self._hist[self._hist_pos] = avg
+                self._hist_pos = (self._hist_pos + 1) % len(self._hist)
+                self._hist_cnt = min(self._hist_cnt + 1, len(self._hist))
                 
                 # Draw min/max boundaries (red)
                 x_min_px = int(self.eye_x_min * 800)
@@ -153,16 +231,20 @@ class EyeMovementDiagnostic:
                 cv2.line(viz, (curr_x, curr_y - 20), (curr_x, curr_y + 20), (0, 255, 0), 3)
                 cv2.circle(viz, (curr_x, curr_y), 5, (0, 255, 0), -1)
                 
-                # Draw history trail
-                if len(self.history_x) > 1:
-                    for i in range(1, len(self.history_x)):
-                        x1 = int(self.history_x[i-1] * 800)
-                        y1 = int(self.history_y[i-1] * 600)
-                        x2 = int(self.history_x[i] * 800)
-                        y2 = int(self.history_y[i] * 600)
-                        alpha = i / len(self.history_x)
+                # Draw history trail (one polyline per gradient bucket instead of
+                # one cv2.line call per segment)
+                n = self._hist_cnt
+                if n > 1:
+                    order = (np.arange(n) + self._hist_pos - n) % len(self._hist)
+                    pts = (self._hist[order] * np.array([800, 600], np.float32)).astype(np.int32)
+
+                    buckets = min(8, n - 1)
+                    edges = np.linspace(0, n - 1, buckets + 1, dtype=np.int64)
+                    for b in range(buckets):
+                        a, e = edges[b], edges[b + 1]
+                        alpha = (e) / n
                         color = (int(100 * alpha), int(150 * alpha), int(200 * alpha))
-                        cv2.line(viz, (x1, y1), (x2, y2), color, 1)
+                        cv2.polylines(viz, [pts[a:e + 1]], False, color, 1)
                 
                 # Display text info
                 x_range = self.eye_x_max - self.eye_x_min
@@ -200,16 +282,76 @@ class EyeMovementDiagnostic:
                 cv2.putText(viz, "NO FACE DETECTED", (200, 300),
                            cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 255), 3)
             
-            cv2.imshow("Eye Movement Diagnostic", viz)
-            
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+            if not headless:
+                cv2.imshow("Eye Movement Diagnostic", viz)
+
+                # pollKey (OpenCV >= 4.5) does not block like waitKey's >= 1 ms wait
+                key = cv2.pollKey() if hasattr(cv2, 'pollKey') else cv2.waitKey(1)
+                if key & 0xFF == ord('q'):
+                    break
         
         self.cap.release()
         cv2.destroyAllWindows()
         self.face_mesh.close()
-        
-        # Final report
+
+        self._print_report()
+
+    def run_replay(self, video_path, batch_size=16):
+        """Run diagnostic over a recorded video, batching inference in N-frame windows.
+
+        Frames are grabbed and color-converted for the whole window first, then
+        FaceMesh runs over the window in a tight loop with no drawing or
+        logging between inferences.
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            print(f"Cannot open video: {video_path}")
+            return
+
+        self.frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        processed = 0
+        detected = 0
+        done = False
+        while not done:
+            # Fill the window
+            batch = []
+            for _ in range(batch_size):
+                ret, frame = cap.read()
+                if not ret:
+                    done = True
+                    break
+                batch.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+            # Inference pass - nothing but FaceMesh in the loop
+            batch_results = [self.face_mesh.process(rgb) for rgb in batch]
+
+            # Stats pass
+            for results in batch_results:
+                processed += 1
+                if not results.multi_face_landmarks:
+                    continue
+                detected += 1
+                landmarks = np.array([
+                    (lm.x * self.frame_width, lm.y * self.frame_height)
+                    for lm in results.multi_face_landmarks[0].landmark
+                ])
+                left_eye = self.get_eye_relative_pos(landmarks, self.LEFT_EYE, self.LEFT_IRIS)
+                right_eye = self.get_eye_relative_pos(landmarks, self.RIGHT_EYE, self.RIGHT_IRIS)
+                avg = np.array([(left_eye[0] + right_eye[0]) / 2,
+                                (left_eye[1] + right_eye[1]) / 2], dtype=np.float32)
+                np.minimum(self._rng_min, avg, out=self._rng_min)
+                np.maximum(self._rng_max, avg, out=self._rng_max)
+
+        cap.release()
+        self.face_mesh.close()
+
+        print(f"\nProcessed {processed} frames, face detected in {detected}")
+        self._print_report()
+
+    def _print_report(self):
+        """Print the final range report."""
         print("\n" + "="*80)
         print("DIAGNOSTIC RESULTS")
         print("="*80)
@@ -252,5 +394,19 @@ class EyeMovementDiagnostic:
         print("\n" + "="*80 + "\n")
 
 if __name__ == "__main__":
-    diagnostic = EyeMovementDiagnostic()
-    diagnostic.run()
+    parser = argparse.ArgumentParser(description="Eye movement range diagnostic")
+    parser.add_argument("--video", help="Replay a recorded video instead of using the camera")
+    parser.add_argument("--batch", type=int, default=16,
+                        help="Frames per inference window in replay mode (default: 16)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run without a display window (batch analysis)")
+    parser.add_argument("--max-frames", type=int, default=None,
+                        help="Stop after this many frames (default: 1000 when headless)")
+    args = parser.parse_args()
+
+    if args.video:
+        diagnostic = EyeMovementDiagnostic(use_camera=False)
+        diagnostic.run_replay(args.video, batch_size=args.batch)
+    else:
+        diagnostic = EyeMovementDiagnostic()
+        diagnostic.run(headless=args.headless, max_frames=args.max_frames)
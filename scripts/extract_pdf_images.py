@@ -7,6 +7,7 @@ Outputs images to ./extracted_images/<pdf-stem>/ as PNG (or native) files.
 """
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
@@ -26,19 +27,20 @@ def extract_images(pdf_path: str, base_out_dir: str = "extracted_images"):
 
     doc = fitz.open(str(pdf))
     count = 0
-    for page_index in range(len(doc)):
-        page = doc[page_index]
+    seen_xrefs = set()
+    for page_number, page in enumerate(doc, start=1):
         image_list = page.get_images(full=True)
         if image_list:
-            print(f"[{pdf.name}] Found {len(image_list)} images on page {page_index+1}")
+            print(f"[{pdf.name}] Found {len(image_list)} images on page {page_number}")
         for img_index, img in enumerate(image_list, start=1):
             xref = img[0]
+            if xref in seen_xrefs:
+                continue  # Same image reused on another page (e.g. logos)
+            seen_xrefs.add(xref)
             base_image = doc.extract_image(xref)
-            image_bytes = base_image["image"]
             image_ext = base_image.get("ext", "png")
-            out_path = out_dir / f"page{page_index+1}_img{img_index}.{image_ext}"
-            with open(out_path, "wb") as f:
-                f.write(image_bytes)
+            out_path = out_dir / f"page{page_number}_img{img_index}.{image_ext}"
+            out_path.write_bytes(base_image["image"])
             print(f"Saved image: {out_path}")
             count += 1
 
@@ -49,5 +51,11 @@ if __name__ == '__main__':
     if len(sys.argv) < 2:
         print("Usage: python extract_pdf_images.py <pdf-file> [<pdf-file> ...]")
         sys.exit(1)
-    for pdf_path in sys.argv[1:]:
-        extract_images(pdf_path)
+    pdf_paths = sys.argv[1:]
+    if len(pdf_paths) == 1:
+        extract_images(pdf_paths[0])
+    else:
+        # Extract each PDF in its own process so a batch finishes in
+        # max(pdf) time instead of sum(pdf) time
+        with ProcessPoolExecutor(max_workers=min(len(pdf_paths), os.cpu_count() or 1)) as executor:
+            list(executor.map(extract_images, pdf_paths))
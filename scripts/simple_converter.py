@@ -4,19 +4,311 @@ Simple and reliable Markdown to DOCX converter for the project proposal
 import re
 from pathlib import Path
 from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
+# Precompiled per-line patterns
+_IMG_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+_NUM_RE = re.compile(r'^\d+\. ')
+_BOLD_RE = re.compile(r'(\*\*[^*]+\*\*)')
+
+# Shared style constants, built once instead of per run
+_FONT = 'Calibri'
+_CENTER = WD_ALIGN_PARAGRAPH.CENTER
+_PT9 = Pt(9)
+_PT10 = Pt(10)
+_PT11 = Pt(11)
+_PT12 = Pt(12)
+_PT14 = Pt(14)
+_PT16 = Pt(16)
+
+# Font size per heading level (level == number of leading hashes)
+_HEADING_SIZES = {1: _PT16, 2: _PT14, 3: _PT12, 4: _PT11}
+_HEADING_STYLE_IDS = {1: 'Heading1', 2: 'Heading2', 3: 'Heading3', 4: 'Heading4'}
+
+
+def _append_para(body, segments, size, style=None, align=None, font=_FONT):
+    """Append a styled paragraph straight to the body XML.
+
+    Bypasses add_paragraph/add_run so long documents don't pay the
+    python-docx object layer per paragraph. segments is an iterable of
+    (text, bold) run tuples; style/align take raw styleId / w:jc values.
+    """
+    p = OxmlElement('w:p')
+    if style or align:
+        pPr = OxmlElement('w:pPr')
+        if style:
+            pStyle = OxmlElement('w:pStyle')
+            pStyle.set(qn('w:val'), style)
+            pPr.append(pStyle)
+        if align:
+            jc = OxmlElement('w:jc')
+            jc.set(qn('w:val'), align)
+            pPr.append(jc)
+        p.append(pPr)
+
+    half_points = str(int(size.pt * 2))
+    for text, bold in segments:
+        r = OxmlElement('w:r')
+        rPr = OxmlElement('w:rPr')
+        fonts = OxmlElement('w:rFonts')
+        fonts.set(qn('w:ascii'), font)
+        fonts.set(qn('w:hAnsi'), font)
+        rPr.append(fonts)
+        if bold:
+            rPr.append(OxmlElement('w:b'))
+        sz = OxmlElement('w:sz')
+        sz.set(qn('w:val'), half_points)
+        rPr.append(sz)
+        r.append(rPr)
+        # A w:t must not contain raw newlines; each embedded '\n' becomes
+        # an explicit w:br, matching what add_run does for '\n' in text
+        for piece_idx, piece in enumerate(text.split('\n')):
+            if piece_idx:
+                r.append(OxmlElement('w:br'))
+            if piece:
+                t = OxmlElement('w:t')
+                t.text = piece
+                t.set(qn('xml:space'), 'preserve')
+                r.append(t)
+        p.append(r)
+
+    # The body's trailing w:sectPr must stay last; append before it so
+    # XML-written paragraphs interleave correctly with add_paragraph/
+    # add_table content and the document stays schema-valid
+    sect_pr = body.find(qn('w:sectPr'))
+    if sect_pr is not None:
+        sect_pr.addprevious(p)
+    else:
+        body.append(p)
+    return p
+
+
+def _is_table_row(line):
+    return '|' in line and line.count('|') >= 2
+
+
+def _iter_cells(row):
+    """Yield stripped, non-empty cell text by scanning for pipes in place."""
+    pos = 0
+    n = len(row)
+    while pos <= n:
+        nxt = row.find('|', pos)
+        if nxt == -1:
+            nxt = n
+        cell = row[pos:nxt].strip()
+        if cell:
+            yield cell
+        pos = nxt + 1
+
+
+def _handle_heading(doc, lines, i):
+    line = lines[i].strip()
+    hashes = len(line) - len(line.lstrip('#'))
+    if hashes in _HEADING_SIZES and line[hashes:hashes + 1] == ' ':
+        heading = line[hashes + 1:].strip()
+        _append_para(doc.element.body, [(heading, False)], _HEADING_SIZES[hashes],
+                     style=_HEADING_STYLE_IDS[hashes],
+                     align='center' if hashes == 1 else None)
+        return i + 1
+    return _handle_fallback(doc, lines, i)
+
+
+def _handle_image(doc, lines, i):
+    line = lines[i].strip()
+    if not line.startswith('!['):
+        return _handle_fallback(doc, lines, i)
+
+    match = _IMG_RE.match(line)
+    if not match:
+        return i + 1
+    alt_text = match.group(1)
+    image_path = match.group(2)
+
+    # Check for caption on next line
+    caption = ""
+    if i + 1 < len(lines) and lines[i + 1].strip().startswith('*'):
+        caption = lines[i + 1].strip()[1:-1]  # Remove asterisks
+        i += 1  # Skip caption line
+
+    # Try to add image
+    try:
+        if Path(image_path).exists():
+            para = doc.add_paragraph()
+            para.alignment = _CENTER
+            run = para.add_run()
+            run.add_picture(image_path, width=Inches(5.5))
+
+            # Add caption
+            if caption:
+                cap_para = doc.add_paragraph()
+                cap_para.alignment = _CENTER
+                cap_run = cap_para.add_run(caption)
+                cap_run.italic = True
+                cap_run.font.size = _PT10
+                cap_run.font.name = _FONT
+        else:
+            # Add placeholder
+            para = doc.add_paragraph(f"[Figure: {alt_text}]")
+            para.alignment = _CENTER
+            for run in para.runs:
+                run.italic = True
+                run.font.name = _FONT
+    except Exception as e:
+        print(f"Could not add image {image_path}: {e}")
+        para = doc.add_paragraph(f"[Figure: {alt_text}]")
+        para.alignment = _CENTER
+
+    return i + 1
+
+
+def _handle_table(doc, lines, i):
+    # Collect table rows, tokenized once while scanning
+    table_rows = []
+    while i < len(lines) and '|' in lines[i]:
+        row = lines[i].strip()
+        if not ('---' in row):  # Skip separator rows
+            table_rows.append(tuple(_iter_cells(row)))
+        i += 1
+
+    if len(table_rows) > 0:
+        # Column count comes from the already-tokenized first row
+        cols = len(table_rows[0])
+
+        if cols > 0:
+            table = doc.add_table(rows=len(table_rows), cols=cols)
+            table.style = 'Table Grid'
+
+            rows_ref = table.rows
+            for row_idx, cells in enumerate(table_rows):
+                if row_idx >= len(rows_ref):
+                    break
+                # Resolve the row's cell list once instead of per cell
+                row_cells = rows_ref[row_idx].cells
+                for col_idx, cell_text in enumerate(cells[:cols]):
+                    cell = row_cells[col_idx]
+                    cell.text = cell_text
+                    # Make header row bold - cell.text leaves one run
+                    if row_idx == 0 and cell.paragraphs[0].runs:
+                        cell.paragraphs[0].runs[0].bold = True
+
+    return i
+
+
+def _handle_code(doc, lines, i):
+    line = lines[i].strip()
+    if not line.startswith('```'):
+        return _handle_fallback(doc, lines, i)
+
+    code_lines = []
+    i += 1
+    while i < len(lines) and not lines[i].strip().startswith('```'):
+        code_lines.append(lines[i])
+        i += 1
+
+    if code_lines:
+        code_text = '\n'.join(code_lines)
+        _append_para(doc.element.body, [(code_text, False)], _PT9, font='Courier New')
+
+    return i + 1
+
+
+def _handle_bullet(doc, lines, i):
+    line = lines[i].strip()
+    bullet_text = line[2:].strip()
+    _append_para(doc.element.body, [(bullet_text, False)], _PT11, style='ListBullet')
+    return i + 1
+
+
+def _handle_num(doc, lines, i):
+    line = lines[i].strip()
+    if _is_table_row(line):
+        return _handle_table(doc, lines, i)
+    if not _NUM_RE.match(line):
+        return _handle_paragraph(doc, lines, i)
+    list_text = _NUM_RE.sub('', line, count=1).strip()
+    _append_para(doc.element.body, [(list_text, False)], _PT11, style='ListNumber')
+    return i + 1
+
+
+def _handle_dash(doc, lines, i):
+    line = lines[i].strip()
+    if _is_table_row(line):
+        return _handle_table(doc, lines, i)
+    if line.startswith('- '):
+        return _handle_bullet(doc, lines, i)
+    if line.startswith('---'):
+        doc.add_paragraph()  # Just add space
+        return i + 1
+    return _handle_paragraph(doc, lines, i)
+
+
+def _handle_star(doc, lines, i):
+    line = lines[i].strip()
+    if _is_table_row(line):
+        return _handle_table(doc, lines, i)
+    if line.startswith('* '):
+        return _handle_bullet(doc, lines, i)
+    return _handle_paragraph(doc, lines, i)
+
+
+def _handle_paragraph(doc, lines, i):
+    line = lines[i].strip()
+
+    # Simple bold formatting
+    if '**' not in line:
+        # Common case: plain prose - skip the regex entirely
+        segments = [(line, False)]
+    elif line.startswith('**') and line.endswith('**') and len(line) > 4:
+        segments = [(line[2:-2], True)]
+    else:
+        # Handle inline formatting (basic) - split by **bold** patterns
+        segments = []
+        for part in _BOLD_RE.split(line):
+            if not part:
+                continue
+            if part.startswith('**') and part.endswith('**'):
+                segments.append((part[2:-2], True))
+            else:
+                segments.append((part, False))
+
+    _append_para(doc.element.body, segments, _PT11)
+    return i + 1
+
+
+def _handle_fallback(doc, lines, i):
+    # Tables can start with any character, so re-check before defaulting
+    line = lines[i].strip()
+    if _is_table_row(line):
+        return _handle_table(doc, lines, i)
+    return _handle_paragraph(doc, lines, i)
+
+
+# First-character dispatch for top-level markdown blocks
+_DISPATCH = {
+    '#': _handle_heading,
+    '!': _handle_image,
+    '|': _handle_fallback,
+    '`': _handle_code,
+    '-': _handle_dash,
+    '*': _handle_star,
+}
+for _digit in '0123456789':
+    _DISPATCH[_digit] = _handle_num
+
+
 def convert_md_to_docx():
     """Convert the enhanced proposal to DOCX"""
-    
-    # Read the markdown file
+
+    # Read the markdown file straight into lines - no intermediate full-text copy
     with open("Simplified_Project_Proposal.md", 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+        lines = f.read().splitlines()
+
     # Create new document
     doc = Document()
-    
+
     # Set margins
     sections = doc.sections
     for section in sections:
@@ -24,191 +316,19 @@ def convert_md_to_docx():
         section.bottom_margin = Inches(1)
         section.left_margin = Inches(1)
         section.right_margin = Inches(1)
-    
-    # Split content into lines
-    lines = content.split('\n')
-    
+
     i = 0
     while i < len(lines):
         line = lines[i].strip()
-        
+
         if not line:
             i += 1
             continue
-        
-        # Main title
-        if line.startswith('# '):
-            title = line[2:].strip()
-            title_para = doc.add_heading(title, level=1)
-            title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            for run in title_para.runs:
-                run.font.size = Pt(16)
-                run.font.name = 'Calibri'
-        
-        # Section headings
-        elif line.startswith('## '):
-            heading = line[3:].strip()
-            h = doc.add_heading(heading, level=2)
-            for run in h.runs:
-                run.font.size = Pt(14)
-                run.font.name = 'Calibri'
-        
-        # Subsection headings
-        elif line.startswith('### '):
-            heading = line[4:].strip()
-            h = doc.add_heading(heading, level=3)
-            for run in h.runs:
-                run.font.size = Pt(12)
-                run.font.name = 'Calibri'
-        
-        # Sub-subsection headings
-        elif line.startswith('#### '):
-            heading = line[5:].strip()
-            h = doc.add_heading(heading, level=4)
-            for run in h.runs:
-                run.font.size = Pt(11)
-                run.font.name = 'Calibri'
-        
-        # Images
-        elif line.startswith('!['):
-            match = re.match(r'!\[([^\]]*)\]\(([^)]+)\)', line)
-            if match:
-                alt_text = match.group(1)
-                image_path = match.group(2)
-                
-                # Check for caption on next line
-                caption = ""
-                if i + 1 < len(lines) and lines[i + 1].strip().startswith('*'):
-                    caption = lines[i + 1].strip()[1:-1]  # Remove asterisks
-                    i += 1  # Skip caption line
-                
-                # Try to add image
-                try:
-                    if Path(image_path).exists():
-                        para = doc.add_paragraph()
-                        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        run = para.add_run()
-                        run.add_picture(image_path, width=Inches(5.5))
-                        
-                        # Add caption
-                        if caption:
-                            cap_para = doc.add_paragraph()
-                            cap_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            cap_run = cap_para.add_run(caption)
-                            cap_run.italic = True
-                            cap_run.font.size = Pt(10)
-                            cap_run.font.name = 'Calibri'
-                    else:
-                        # Add placeholder
-                        para = doc.add_paragraph(f"[Figure: {alt_text}]")
-                        para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        for run in para.runs:
-                            run.italic = True
-                            run.font.name = 'Calibri'
-                except Exception as e:
-                    print(f"Could not add image {image_path}: {e}")
-                    para = doc.add_paragraph(f"[Figure: {alt_text}]")
-                    para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        # Tables
-        elif '|' in line and line.count('|') >= 2:
-            # Collect table rows
-            table_rows = []
-            start_i = i
-            while i < len(lines) and '|' in lines[i]:
-                row = lines[i].strip()
-                if not ('---' in row):  # Skip separator rows
-                    table_rows.append(row)
-                i += 1
-            i -= 1  # Back up one
-            
-            if len(table_rows) > 0:
-                # Parse first row to get column count
-                first_row_cells = [cell.strip() for cell in table_rows[0].split('|') if cell.strip()]
-                cols = len(first_row_cells)
-                
-                if cols > 0:
-                    table = doc.add_table(rows=len(table_rows), cols=cols)
-                    table.style = 'Table Grid'
-                    
-                    for row_idx, row_text in enumerate(table_rows):
-                        cells = [cell.strip() for cell in row_text.split('|') if cell.strip()]
-                        for col_idx, cell_text in enumerate(cells):
-                            if col_idx < cols and row_idx < len(table.rows):
-                                cell = table.rows[row_idx].cells[col_idx]
-                                cell.text = cell_text
-                                # Make header row bold
-                                if row_idx == 0:
-                                    for paragraph in cell.paragraphs:
-                                        for run in paragraph.runs:
-                                            run.bold = True
-        
-        # Code blocks
-        elif line.startswith('```'):
-            code_lines = []
-            i += 1
-            while i < len(lines) and not lines[i].strip().startswith('```'):
-                code_lines.append(lines[i])
-                i += 1
-            
-            if code_lines:
-                code_para = doc.add_paragraph()
-                code_text = '\n'.join(code_lines)
-                code_run = code_para.add_run(code_text)
-                code_run.font.name = 'Courier New'
-                code_run.font.size = Pt(9)
-        
-        # Bullet points
-        elif line.startswith('- ') or line.startswith('* '):
-            bullet_text = line[2:].strip()
-            para = doc.add_paragraph(bullet_text, style='List Bullet')
-            for run in para.runs:
-                run.font.name = 'Calibri'
-                run.font.size = Pt(11)
-        
-        # Numbered lists
-        elif re.match(r'^\d+\. ', line):
-            list_text = re.sub(r'^\d+\. ', '', line).strip()
-            para = doc.add_paragraph(list_text, style='List Number')
-            for run in para.runs:
-                run.font.name = 'Calibri'
-                run.font.size = Pt(11)
-        
-        # Horizontal rules (skip)
-        elif line.startswith('---'):
-            doc.add_paragraph()  # Just add space
-        
-        # Regular paragraphs
-        else:
-            if line:
-                para = doc.add_paragraph()
-                
-                # Simple bold formatting
-                if line.startswith('**') and line.endswith('**') and len(line) > 4:
-                    text = line[2:-2]
-                    run = para.add_run(text)
-                    run.bold = True
-                    run.font.name = 'Calibri'
-                    run.font.size = Pt(11)
-                else:
-                    # Handle inline formatting (basic)
-                    text = line
-                    # Split by **bold** patterns
-                    parts = re.split(r'(\*\*[^*]+\*\*)', text)
-                    
-                    for part in parts:
-                        if part.startswith('**') and part.endswith('**'):
-                            run = para.add_run(part[2:-2])
-                            run.bold = True
-                        elif part:
-                            run = para.add_run(part)
-                        
-                        if 'run' in locals():
-                            run.font.name = 'Calibri'
-                            run.font.size = Pt(11)
-        
-        i += 1
-    
+
+        # One dict lookup on the first character replaces the elif ladder
+        handler = _DISPATCH.get(line[0], _handle_fallback)
+        i = handler(doc, lines, i)
+
     # Save the document
     output_file = "Enhanced_Project_Proposal.docx"
     doc.save(output_file)
@@ -216,4 +336,4 @@ def convert_md_to_docx():
     return output_file
 
 if __name__ == "__main__":
-    convert_md_to_docx()
\ No newline at end of file
+    convert_md_to_docx()
@@ -411,8 +411,7 @@ class EnhancedEyeTracker:
                 )
                 
                 # Handle commands from control panel
-                cmd = self.control_panel.get_command()
-                if cmd:
+                for cmd in self.control_panel.get_commands():
                     self.handle_command(cmd, results)
             
             # Show raw gaze overlay
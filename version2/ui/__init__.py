@@ -1,6 +1,15 @@
 """UI Package - Control Panel and Overlay Components"""
 
-from .control_panel import AdvancedControlPanel
-from .overlay_window import CalibrationOverlay
-
 __all__ = ['AdvancedControlPanel', 'CalibrationOverlay']
+
+
+def __getattr__(name):
+    # Lazy imports (PEP 562): importing the package no longer drags in
+    # cv2/PIL/numpy for scripts that only need one component
+    if name == 'AdvancedControlPanel':
+        from .control_panel import AdvancedControlPanel
+        return AdvancedControlPanel
+    if name == 'CalibrationOverlay':
+        from .overlay_window import CalibrationOverlay
+        return CalibrationOverlay
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
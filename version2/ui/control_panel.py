@@ -11,19 +11,34 @@ import numpy as np
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
-import threading
-import time
 import queue
 
 
 class AdvancedControlPanel:
     """Comprehensive control panel with live preview and full controls."""
-    
+
+    # Static (text, color) pairs for boolean status fields
+    _FACE_TEXT = {True: ("✓ Detected", '#00ff00'), False: ("✗ No Face", '#ff0000')}
+    _CALIB_TEXT = {True: ("✓ Calibrated", '#00ff00'), False: ("✗ Not Calibrated", '#ff9800')}
+    _CURSOR_TEXT = {True: ("ON", '#00ff00'), False: ("OFF", '#ff0000')}
+    _SMOOTH_TEXT = {True: ("ON", '#00ff00'), False: ("OFF", '#00ff00')}
+
     def __init__(self, title="Eye Tracking Control Panel"):
         """Initialize the advanced control panel."""
         self.title = title
         self.running = True
-        self.current_frame = None
+
+        # Single-slot, drop-oldest handoff from the capture loop to the UI
+        self._frame_q = queue.Queue(maxsize=1)
+
+        # Reused preview buffers and a persistent PhotoImage pasted in place.
+        # Two RGB buffers alternate so the producer never overwrites the one
+        # the UI is still reading.
+        self._resize_buf = np.empty((360, 480, 3), dtype=np.uint8)
+        self._rgb_bufs = [np.empty((360, 480, 3), dtype=np.uint8),
+                          np.empty((360, 480, 3), dtype=np.uint8)]
+        self._buf_idx = 0
+        self._photo = None
         self.status_data = {
             'fps': 0,
             'face_detected': False,
@@ -45,11 +60,16 @@ class AdvancedControlPanel:
         
         # Create UI components
         self._create_ui()
-        
-        # Start update thread
-        self.update_thread = threading.Thread(target=self._update_loop, daemon=True)
-        self.update_thread.start()
-        
+
+        # Dirty flags - UI refresh is scheduled on Tk's own loop only when
+        # new data arrives, instead of a 30 FPS polling thread
+        self._dirty_frame = False
+        self._dirty_status = False
+        self._flush_scheduled = False
+
+        # Last value applied to each status label, to skip no-op .config calls
+        self._last_status = {}
+
     def _create_ui(self):
         """Create the user interface."""
         # Title bar
@@ -230,87 +250,137 @@ class AdvancedControlPanel:
         # Bind keyboard shortcuts
         self.root.bind('<KeyPress>', self._on_key_press)
         
-    def _update_loop(self):
-        """Update the UI in a separate thread."""
-        while self.running:
-            try:
+    def _schedule_flush(self):
+        """Queue a UI refresh on the Tk event loop (coalesces repeat calls)."""
+        if self._flush_scheduled or not self.running:
+            return
+        self._flush_scheduled = True
+        try:
+            self.root.after_idle(self._flush)
+        except tk.TclError:
+            self._flush_scheduled = False
+
+    def _flush(self):
+        """Apply pending frame/status updates from the Tk thread."""
+        self._flush_scheduled = False
+        try:
+            if self._dirty_frame:
+                self._dirty_frame = False
                 self._update_video()
+            if self._dirty_status:
+                self._dirty_status = False
                 self._update_status()
-                time.sleep(0.03)  # ~30 FPS
-            except Exception as e:
-                print(f"UI update error: {e}")
-                
+        except Exception as e:
+            print(f"UI update error: {e}")
+
     def _update_video(self):
         """Update the video preview."""
-        if self.current_frame is not None:
-            try:
-                # Resize frame to fit canvas
-                frame = cv2.resize(self.current_frame, (480, 360))
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                image = Image.fromarray(frame_rgb)
-                photo = ImageTk.PhotoImage(image=image)
-                
-                self.video_canvas.configure(image=photo)
-                self.video_canvas.image = photo
-            except Exception as e:
-                pass
-                
-    def _update_status(self):
-        """Update status labels."""
         try:
-            self.status_labels['mode'].config(text=self.status_data['mode'])
-            self.status_labels['fps'].config(text=str(self.status_data['fps']))
-            
-            # Face detection
-            face_text = "✓ Detected" if self.status_data['face_detected'] else "✗ No Face"
-            face_color = '#00ff00' if self.status_data['face_detected'] else '#ff0000'
-            self.status_labels['face'].config(text=face_text, fg=face_color)
-            
-            # Calibration
-            calib_text = "✓ Calibrated" if self.status_data['calibrated'] else "✗ Not Calibrated"
-            calib_color = '#00ff00' if self.status_data['calibrated'] else '#ff9800'
-            self.status_labels['calibrated'].config(text=calib_text, fg=calib_color)
-            
-            # Cursor control
-            cursor_text = "ON" if self.status_data['cursor_enabled'] else "OFF"
-            cursor_color = '#00ff00' if self.status_data['cursor_enabled'] else '#ff0000'
-            self.status_labels['cursor'].config(text=cursor_text, fg=cursor_color)
-            
-            # Smoothing
-            smooth_text = "ON" if self.status_data['smoothing_enabled'] else "OFF"
-            self.status_labels['smoothing'].config(text=smooth_text)
-            
-            # Gain
-            self.status_labels['gain'].config(text=f"{self.status_data['gain']:.2f}")
-            
-            # Position
-            pos = self.status_data['cursor_pos']
-            self.status_labels['position'].config(text=f"({pos[0]}, {pos[1]})")
-        except Exception as e:
+            rgb = self._frame_q.get_nowait()
+        except queue.Empty:
+            return
+
+        # The frame arrives pre-sized and converted; only wrap and paste here
+        image = Image.fromarray(rgb)
+
+        # Only the Tk widget calls can legitimately fail (window destroyed
+        # mid-update), so the try is narrowed to just those
+        try:
+            if self._photo is None:
+                self._photo = ImageTk.PhotoImage(image=image)
+                self.video_canvas.configure(image=self._photo)
+                self.video_canvas.image = self._photo
+            else:
+                # Paste into the existing PhotoImage instead of recreating it
+                self._photo.paste(image)
+        except tk.TclError:
             pass
+
+    def _update_status(self):
+        """Update status labels, touching only labels whose value changed."""
+        try:
+            if not self.root.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        data = self.status_data
+        pos = data['cursor_pos']
+        updates = {
+            'mode': (data['mode'], '#00ff00'),
+            'fps': (str(data['fps']), '#00ff00'),
+            'face': self._FACE_TEXT[bool(data['face_detected'])],
+            'calibrated': self._CALIB_TEXT[bool(data['calibrated'])],
+            'cursor': self._CURSOR_TEXT[bool(data['cursor_enabled'])],
+            'smoothing': self._SMOOTH_TEXT[bool(data['smoothing_enabled'])],
+            'gain': (f"{data['gain']:.2f}", '#00ff00'),
+            'position': (f"({pos[0]}, {pos[1]})", '#00ff00'),
+        }
+        last = self._last_status
+        for key, new in updates.items():
+            if last.get(key) != new:
+                self.status_labels[key].config(text=new[0], fg=new[1])
+                last[key] = new
     
     def update_frame(self, frame):
-        """Update the current video frame."""
-        self.current_frame = frame
-        
+        """Hand the latest video frame to the UI (drops the previous one).
+
+        The resize and BGR->RGB conversion run here, in the capture thread,
+        so the Tk callback only wraps the bytes and pastes them.
+        """
+        try:
+            rgb = self._rgb_bufs[self._buf_idx]
+            self._buf_idx ^= 1
+            cv2.resize(frame, (480, 360), dst=self._resize_buf)
+            cv2.cvtColor(self._resize_buf, cv2.COLOR_BGR2RGB, dst=rgb)
+        except Exception:
+            return
+        try:
+            self._frame_q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            self._frame_q.put_nowait(rgb)
+        except queue.Full:
+            pass
+        self._dirty_frame = True
+        self._schedule_flush()
+
     def update_status(self, **kwargs):
         """Update status data."""
         self.status_data.update(kwargs)
+        self._dirty_status = True
+        self._schedule_flush()
         
+    MAX_QUEUED_COMMANDS = 64
+
     def send_command(self, cmd):
         """Add command to queue."""
-        try:
-            self.command_queue.put(cmd, block=False)
+        if self.command_queue.qsize() < self.MAX_QUEUED_COMMANDS:
+            self.command_queue.put_nowait(cmd)
             print(f"Command sent: {cmd}")
-        except queue.Full:
+        else:
             print(f"Command queue full, skipping: {cmd}")
-        
+
     def get_command(self):
         """Get next command from queue."""
+        if self.command_queue.empty():
+            return None
         try:
-            return self.command_queue.get(block=False)
+            return self.command_queue.get_nowait()
         except queue.Empty:
             return None
+
+    def get_commands(self, max_n=16):
+        """Drain up to max_n pending commands in one call."""
+        out = []
+        q = self.command_queue
+        while len(out) < max_n and not q.empty():
+            try:
+                out.append(q.get_nowait())
+            except queue.Empty:
+                break
+        return out
     
     def _on_key_press(self, event):
         """Handle keyboard shortcuts."""
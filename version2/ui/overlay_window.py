@@ -6,6 +6,7 @@ Transparent fullscreen overlay for displaying calibration points.
 Author: SHA Graduation Project Group 24
 """
 
+import time
 import tkinter as tk
 from typing import Tuple, List
 
@@ -44,7 +45,67 @@ class CalibrationOverlay:
             height=screen_height
         )
         self.canvas.pack(fill=tk.BOTH, expand=True)
-        
+
+        # Persistent canvas items - created once here, mutated per frame
+        # via coords/itemconfig instead of delete("all") + recreate
+        self._point_items = []
+        self._num_items = []
+        self._point_state = []
+
+        self._arc_item = self.canvas.create_arc(
+            0, 0, 0, 0, start=90, extent=0,
+            outline='#00ff00', width=4, style=tk.ARC, state='hidden'
+        )
+        self._progress_item = self.canvas.create_text(
+            0, 0, text='', fill='white',
+            font=('Arial', 14, 'bold'), state='hidden'
+        )
+        self._arc_pos = None
+        self._progress_text = None
+
+        # Fast-path tracking: while the active point is unchanged, only
+        # its pulse/arc/progress items need touching
+        self._last_current_idx = None
+        self._last_grid = None
+
+        # Static instruction labels
+        self.canvas.create_text(
+            screen_width // 2, screen_height - 100,
+            text="Look at the RED circle and hold your gaze steady",
+            fill='white',
+            font=('Arial', 18, 'bold')
+        )
+        self.canvas.create_text(
+            screen_width // 2, screen_height - 60,
+            text="Press ESC to cancel calibration",
+            fill='#cccccc',
+            font=('Arial', 12)
+        )
+
+        # Full event processing happens at most every 50 ms from render();
+        # there is no mainloop, so timers would never fire on this window
+        self._last_pump = 0.0
+
+    def _ensure_items(self, n: int):
+        """Grow/shrink the pooled point items to match the grid size."""
+        canvas = self.canvas
+        for idx in range(len(self._point_items), n):
+            self._point_items.append(canvas.create_oval(
+                0, 0, 0, 0, outline='white', state='hidden'))
+            self._num_items.append(canvas.create_text(
+                0, 0, text=str(idx + 1), fill='white', state='hidden'))
+            self._point_state.append(None)
+        for idx in range(n, len(self._point_items)):
+            canvas.itemconfig(self._point_items[idx], state='hidden')
+            canvas.itemconfig(self._num_items[idx], state='hidden')
+            self._point_state[idx] = None
+        # Keep the z-order of the old draw sequence: arc above the current
+        # oval, numbers above everything
+        canvas.tag_raise(self._arc_item)
+        for num in self._num_items:
+            canvas.tag_raise(num)
+        canvas.tag_raise(self._progress_item)
+
     def render(self, calibration_grid: List[Tuple[int, int]], 
                current_idx: int, current_frame: int, total_frames: int):
         """
@@ -58,83 +119,82 @@ class CalibrationOverlay:
         """
         if self.overlay is None:
             self.create_overlay()
-            
-        # Clear canvas
-        self.canvas.delete("all")
-        
-        # Draw all calibration points
-        for idx, (x, y) in enumerate(calibration_grid):
+
+        canvas = self.canvas
+
+        # Fast path: same grid and same active point means every other
+        # point is already correct - only touch the pulsing one
+        fast = (current_idx == self._last_current_idx
+                and calibration_grid is self._last_grid
+                and len(calibration_grid) == len(self._point_items))
+        if not fast:
+            if len(calibration_grid) != len(self._point_items):
+                self._ensure_items(len(calibration_grid))
+            self._last_current_idx = current_idx
+            self._last_grid = calibration_grid
+
+        if fast and 0 <= current_idx < len(calibration_grid):
+            indices = range(current_idx, current_idx + 1)
+        elif fast:
+            indices = range(0)
+        else:
+            indices = range(len(calibration_grid))
+
+        # Update calibration points in place, skipping unchanged ones
+        for idx in indices:
+            x, y = calibration_grid[idx]
             if idx == current_idx:
                 # Current point - large red circle with pulsing effect
-                pulse_size = 30 + int(10 * abs((current_frame % 30) - 15) / 15)
-                self.canvas.create_oval(
-                    x - pulse_size, y - pulse_size,
-                    x + pulse_size, y + pulse_size,
-                    fill='red', outline='white', width=3
-                )
-                
-                # Progress ring
-                progress = (current_frame / total_frames) * 360
-                self.canvas.create_arc(
-                    x - 40, y - 40, x + 40, y + 40,
-                    start=90, extent=-progress,
-                    outline='#00ff00', width=4, style=tk.ARC
-                )
-                
-                # Point number
-                self.canvas.create_text(
-                    x, y,
-                    text=str(idx + 1),
-                    fill='white',
-                    font=('Arial', 20, 'bold')
-                )
-                
-                # Progress text
-                progress_pct = int((current_frame / total_frames) * 100)
-                self.canvas.create_text(
-                    x, y + 70,
-                    text=f"Point {idx + 1}/{len(calibration_grid)} - {progress_pct}%",
-                    fill='white',
-                    font=('Arial', 14, 'bold')
-                )
+                size = 30 + int(10 * abs((current_frame % 30) - 15) / 15)
+                state = (x, y, 'red', size, 3, 20)
             else:
-                # Other points - small gray circles
-                size = 15
+                # Other points - small circles, green once completed
                 color = '#00ff00' if idx < current_idx else '#555555'
-                self.canvas.create_oval(
-                    x - size, y - size,
-                    x + size, y + size,
-                    fill=color, outline='white', width=2
-                )
-                
-                # Point number
-                self.canvas.create_text(
-                    x, y,
-                    text=str(idx + 1),
-                    fill='white',
-                    font=('Arial', 10, 'bold')
-                )
-        
-        # Instructions at bottom
-        screen_height = self.overlay.winfo_screenheight()
-        screen_width = self.overlay.winfo_screenwidth()
-        
-        self.canvas.create_text(
-            screen_width // 2, screen_height - 100,
-            text="Look at the RED circle and hold your gaze steady",
-            fill='white',
-            font=('Arial', 18, 'bold')
-        )
-        
-        self.canvas.create_text(
-            screen_width // 2, screen_height - 60,
-            text="Press ESC to cancel calibration",
-            fill='#cccccc',
-            font=('Arial', 12)
-        )
-        
-        # Update display
-        self.overlay.update()
+                state = (x, y, color, 15, 2, 10)
+
+            if self._point_state[idx] != state:
+                x, y, color, size, width, font_size = state
+                canvas.coords(self._point_items[idx],
+                              x - size, y - size, x + size, y + size)
+                canvas.itemconfig(self._point_items[idx],
+                                  fill=color, width=width, state='normal')
+                canvas.coords(self._num_items[idx], x, y)
+                canvas.itemconfig(self._num_items[idx],
+                                  font=('Arial', font_size, 'bold'),
+                                  state='normal')
+                self._point_state[idx] = state
+
+        # Progress ring and text follow the current point
+        if 0 <= current_idx < len(calibration_grid):
+            x, y = calibration_grid[current_idx]
+            if self._arc_pos != (x, y):
+                canvas.coords(self._arc_item, x - 40, y - 40, x + 40, y + 40)
+                canvas.coords(self._progress_item, x, y + 70)
+                self._arc_pos = (x, y)
+
+            progress = (current_frame / total_frames) * 360
+            canvas.itemconfig(self._arc_item, extent=-progress, state='normal')
+
+            progress_pct = int((current_frame / total_frames) * 100)
+            text = f"Point {current_idx + 1}/{len(calibration_grid)} - {progress_pct}%"
+            if text != self._progress_text:
+                canvas.itemconfig(self._progress_item, text=text)
+                self._progress_text = text
+            canvas.itemconfig(self._progress_item, state='normal')
+        else:
+            canvas.itemconfig(self._arc_item, state='hidden')
+            canvas.itemconfig(self._progress_item, state='hidden')
+
+        # Flush the batched item mutations. Most frames only need the
+        # deferred redraws serviced; the full event queue (input,
+        # window-manager messages) is pumped at ~20 Hz so render latency
+        # stays decoupled from Tk event throughput
+        now = time.monotonic()
+        if now - self._last_pump >= 0.05:
+            self._last_pump = now
+            self.overlay.update()
+        else:
+            self.overlay.update_idletasks()
         
     def close(self):
         """Close the overlay window."""
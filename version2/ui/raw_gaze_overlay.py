@@ -6,11 +6,58 @@ Shows raw eye gaze position with liquid-like visual effect.
 Author: SHA Graduation Project Group 24
 """
 
+import math
+
 import cv2
 import numpy as np
-from collections import deque
 from typing import Tuple
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def _rasterize_radial(img, cx, cy, radius, inner, floor, opacity, b, g, r):
+    """Rasterize one radial-gradient blob into a BGR uint8 image.
+
+    Scalar-loop twin of RawGazeOverlay._blit_radial, written so numba can
+    compile it with row-parallel scheduling when available.
+    """
+    h, w = img.shape[0], img.shape[1]
+    y0 = cy - radius if cy - radius > 0 else 0
+    y1 = cy + radius if cy + radius < h else h
+    x0 = cx - radius if cx - radius > 0 else 0
+    x1 = cx + radius if cx + radius < w else w
+    span = float(radius - inner)
+    for y in prange(y0, y1):
+        dy = y - cy
+        for x in range(x0, x1):
+            dx = x - cx
+            d = math.sqrt(dx * dx + dy * dy)
+            f = (radius - d) / span
+            if f > 1.0:
+                f = 1.0
+            elif f < 0.0:
+                f = 0.0
+            if floor > 0.0:
+                f = floor + (1.0 - floor) * f if d <= radius else 0.0
+            f *= opacity
+            vb = int(f * b)
+            vg = int(f * g)
+            vr = int(f * r)
+            if vb > img[y, x, 0]:
+                img[y, x, 0] = vb
+            if vg > img[y, x, 1]:
+                img[y, x, 1] = vg
+            if vr > img[y, x, 2]:
+                img[y, x, 2] = vr
+
+
+if njit is not None:
+    _rasterize_radial = njit(cache=True, fastmath=True, parallel=True)(_rasterize_radial)
+
 
 class RawGazeOverlay:
     """Liquid-effect overlay showing raw gaze position."""
@@ -20,9 +67,14 @@ class RawGazeOverlay:
         self.screen_width = screen_width
         self.screen_height = screen_height
         
-        # Trail effect (liquid motion)
+        # Trail effect (liquid motion) - fixed ring buffer instead of a
+        # deque of tuples, so render() consumes it with array ops
         self.trail_length = 15
-        self.gaze_trail = deque(maxlen=self.trail_length)
+        self._trail = np.zeros((self.trail_length, 2), np.int32)
+        self._trail_head = 0
+        self._trail_n = 0
+        self._trail_weights = np.arange(1, self.trail_length + 1,
+                                        dtype=np.float32)
         
         # Liquid blob parameters
         self.blob_base_radius = 30
@@ -35,7 +87,78 @@ class RawGazeOverlay:
         # Color gradient (cyan to blue)
         self.color_start = np.array([255, 255, 0])  # Cyan
         self.color_end = np.array([255, 100, 0])    # Blue
-        
+
+        # Internal render resolution: the soft blob and blurry trail have
+        # no detail worth full screen resolution, so compose at half size
+        # and upscale once at the end of render()
+        self.render_scale = 0.5
+        self._rw = int(screen_width * self.render_scale)
+        self._rh = int(screen_height * self.render_scale)
+        self._small_canvas = np.zeros((self._rh, self._rw, 3), np.uint8)
+        self._out = np.empty((screen_height, screen_width, 3), np.uint8)
+
+        # Pre-rendered pulse sprites (one per quantized size) so render()
+        # only pastes an ROI for the current position
+        self._pulse_factors = np.linspace(0.7, 1.3, 13)
+        self._pulse_sprites = [self._make_pulse_sprite(f)
+                               for f in self._pulse_factors]
+
+        # Quantized animation wheel: each of 32 phase steps maps straight
+        # to a sprite index, so render() never evaluates sin()
+        wheel = np.sin(2 * np.pi * np.arange(32) / 32)
+        self._phase_to_sprite = np.clip(
+            np.round((1.0 + wheel * 0.3 - 0.7) / 0.05),
+            0, len(self._pulse_sprites) - 1).astype(np.intp)
+
+        # Quarter-resolution heat buffer for the trail: point impulses
+        # blurred once by cv2.GaussianBlur replace per-point gradient
+        # drawing, and the blur runs on 1/16th of the pixels
+        self._heat_h = (screen_height + 3) // 4
+        self._heat_w = (screen_width + 3) // 4
+        self._heat = np.zeros((self._heat_h, self._heat_w), np.float32)
+        self._heat_sigma = self.blob_base_radius / 4.0
+        # Scale so the newest impulse peaks near the old 60% trail opacity
+        self._heat_gain = 0.6 * 2.0 * math.pi * self._heat_sigma ** 2
+        self._heat_u8 = np.empty((self._heat_h, self._heat_w), np.uint8)
+
+        # 256-entry intensity-to-BGR LUT with brightness baked in: faint
+        # heat renders in the trail-end hue, strong heat in the start hue.
+        # Colorizing becomes one fancy index, no float math per frame
+        levels = np.linspace(0.0, 1.0, 256)[:, None]
+        grad = self.color_end * (1 - levels) + self.color_start * levels
+        self._trail_lut = (grad * levels).astype(np.uint8)
+
+    def _make_pulse_sprite(self, factor: float) -> np.ndarray:
+        """Build the glow + blob + core + ring sprite for one pulse size."""
+        pulse_radius = int(self.blob_base_radius * factor * self.render_scale)
+        glow_radius = int(pulse_radius * 1.8)
+        c = glow_radius
+        sprite = np.zeros((2 * glow_radius, 2 * glow_radius, 3), dtype=np.uint8)
+
+        self._blit_radial(sprite, c, c, glow_radius,
+                          np.array([255, 200, 0]), 0.3, inner=pulse_radius)
+        self._blit_radial(sprite, c, c, pulse_radius,
+                          np.array([255, 255, 0]), 1.0, floor=0.3)
+
+        core_radius = max(3, int(pulse_radius * 0.3))
+        cv2.circle(sprite, (c, c), core_radius, (255, 255, 255), -1)
+
+        ring_thickness = max(2, int(pulse_radius * 0.1))
+        cv2.circle(sprite, (c, c), pulse_radius, (255, 255, 255), ring_thickness)
+        return sprite
+
+    def _paste(self, overlay: np.ndarray, sprite: np.ndarray, x: int, y: int):
+        """np.maximum-composite a centered sprite into the canvas, clipped."""
+        h, w = sprite.shape[:2]
+        ox, oy = x - w // 2, y - h // 2
+        x0, y0 = max(ox, 0), max(oy, 0)
+        x1 = min(ox + w, overlay.shape[1])
+        y1 = min(oy + h, overlay.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+        roi = overlay[y0:y1, x0:x1]
+        np.maximum(roi, sprite[y0 - oy:y1 - oy, x0 - ox:x1 - ox], out=roi)
+
     def update(self, raw_x: float, raw_y: float):
         """
         Update gaze position.
@@ -52,25 +175,59 @@ class RawGazeOverlay:
         screen_x = max(0, min(self.screen_width - 1, screen_x))
         screen_y = max(0, min(self.screen_height - 1, screen_y))
         
-        # Add to trail
-        self.gaze_trail.append((screen_x, screen_y))
+        # Add to trail ring buffer
+        self._trail[self._trail_head, 0] = screen_x
+        self._trail[self._trail_head, 1] = screen_y
+        self._trail_head = (self._trail_head + 1) % self.trail_length
+        if self._trail_n < self.trail_length:
+            self._trail_n += 1
         
         # Update pulse animation
         self.pulse_phase += self.pulse_speed
         if self.pulse_phase > 2 * np.pi:
             self.pulse_phase = 0
     
-    def _draw_liquid_blob(self, overlay: np.ndarray, x: int, y: int, 
+    def _blit_radial(self, overlay: np.ndarray, x: int, y: int, radius: int,
+                     color: np.ndarray, opacity: float,
+                     inner: int = 0, floor: float = 0.0):
+        """Composite one radial-gradient blob into the canvas.
+
+        Replaces the old per-radius cv2.circle loops with a single
+        vectorized write: a distance field over the bounding box gives
+        the opacity ramp, and np.maximum blends it into the ROI. One
+        Python/C transition per blob instead of one per ring.
+        """
+        if radius <= 0:
+            return
+
+        if njit is not None:
+            _rasterize_radial(overlay, x, y, radius, inner, floor, opacity,
+                              float(color[0]), float(color[1]), float(color[2]))
+            return
+
+        x0, x1 = max(x - radius, 0), min(x + radius, overlay.shape[1])
+        y0, y1 = max(y - radius, 0), min(y + radius, overlay.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        yy, xx = np.ogrid[y0 - y:y1 - y, x0 - x:x1 - x]
+        d = np.sqrt((xx * xx + yy * yy).astype(np.float32))
+
+        # Linear falloff from full opacity at `inner` to zero at `radius`
+        falloff = np.clip((radius - d) / float(radius - inner), 0.0, 1.0)
+        if floor:
+            # Keep a minimum brightness inside the disk, zero outside
+            falloff = np.where(d <= radius, floor + (1.0 - floor) * falloff, 0.0)
+        falloff *= opacity
+
+        roi = overlay[y0:y1, x0:x1]
+        np.maximum(roi, (falloff[..., None] * color).astype(np.uint8), out=roi)
+
+    def _draw_liquid_blob(self, overlay: np.ndarray, x: int, y: int,
                           radius: float, opacity: float, color: np.ndarray):
         """Draw a single liquid blob with gradient."""
-        # Create gradient effect
-        for r in range(int(radius), 0, -2):
-            ratio = r / radius
-            current_opacity = int(opacity * 255 * ratio)
-            current_color = tuple(map(int, color * ratio))
-            
-            cv2.circle(overlay, (x, y), r, current_color, -1)
-    
+        self._blit_radial(overlay, x, y, int(radius), color, opacity)
+
     def render(self) -> np.ndarray:
         """
         Render the liquid gaze overlay.
@@ -78,66 +235,49 @@ class RawGazeOverlay:
         Returns:
             BGR overlay image (black background with colored blob)
         """
-        # Create black canvas
-        overlay = np.zeros((self.screen_height, self.screen_width, 3), dtype=np.uint8)
-        
-        if len(self.gaze_trail) == 0:
-            return overlay
-        
-        # Draw trail with fading effect
-        for i, (x, y) in enumerate(self.gaze_trail):
-            # Calculate trail properties
-            trail_ratio = i / len(self.gaze_trail)  # 0 (oldest) to 1 (newest)
-            
-            # Fade older positions
-            opacity = trail_ratio * 0.6  # Max 60% for trail
-            radius = int(self.blob_base_radius * (0.3 + trail_ratio * 0.7))
-            
-            # Color gradient along trail (BGR format)
-            color = self.color_start * (1 - trail_ratio) + self.color_end * trail_ratio
-            color_bgr = tuple(map(int, color))
-            
-            # Draw trail blob with decreasing intensity
-            for r in range(radius, 0, -3):
-                r_ratio = r / radius
-                intensity = opacity * r_ratio
-                trail_color = tuple(int(c * intensity) for c in color_bgr)
-                cv2.circle(overlay, (x, y), r, trail_color, -1)
-        
-        # Draw current position with pulse effect
-        if len(self.gaze_trail) > 0:
-            current_x, current_y = self.gaze_trail[-1]
-            
-            # Pulsing radius
-            pulse = np.sin(self.pulse_phase)
-            pulse_radius = int(self.blob_base_radius * (1.0 + pulse * 0.3))
-            
-            # Outer glow (larger, more transparent)
-            glow_radius = int(pulse_radius * 1.8)
-            for r in range(glow_radius, pulse_radius, -4):
-                r_ratio = (r - pulse_radius) / (glow_radius - pulse_radius)
-                intensity = 0.3 * (1 - r_ratio)
-                glow_color = (int(255 * intensity), int(200 * intensity), 0)
-                cv2.circle(overlay, (current_x, current_y), r, glow_color, -1)
-            
-            # Main blob (cyan/yellow bright)
-            for r in range(pulse_radius, 0, -2):
-                r_ratio = r / pulse_radius
-                intensity = r_ratio * 0.7 + 0.3
-                blob_color = (int(255 * intensity), int(255 * intensity), 0)
-                cv2.circle(overlay, (current_x, current_y), r, blob_color, -1)
-            
-            # Center highlight (white core)
-            core_radius = max(3, int(pulse_radius * 0.3))
-            cv2.circle(overlay, (current_x, current_y), core_radius, (255, 255, 255), -1)
-            
-            # Outer ring (white)
-            ring_thickness = max(2, int(pulse_radius * 0.1))
-            cv2.circle(overlay, (current_x, current_y), pulse_radius, (255, 255, 255), ring_thickness)
+        # Reset the reused half-resolution canvas
+        overlay = self._small_canvas
+        overlay.fill(0)
+
+        n = self._trail_n
+        if n == 0:
+            self._out.fill(0)
+            return self._out
+
+        # Oldest-to-newest view of the ring buffer
+        idx = (self._trail_head - n + np.arange(n)) % self.trail_length
+        coords = self._trail[idx]
         
-        return overlay
+        # Draw trail with fading effect: weighted point impulses into the
+        # quarter-res heat map, one Gaussian blur, colorize, upscale
+        heat = self._heat
+        heat.fill(0.0)
+        # Coordinates are clamped to screen bounds in update(), so the
+        # quarter-res indices are always in range
+        np.add.at(heat, (coords[:, 1] >> 2, coords[:, 0] >> 2),
+                  self._trail_weights[:n] / n)  # newer points weigh more
+        cv2.GaussianBlur(heat, (0, 0), self._heat_sigma, dst=heat)
+        np.clip(heat * (self._heat_gain * 255.0), 0, 255, out=heat)
+        np.copyto(self._heat_u8, heat, casting='unsafe')
+        small = self._trail_lut[self._heat_u8]
+        trail = cv2.resize(small, (self._rw, self._rh),
+                           interpolation=cv2.INTER_LINEAR)
+        np.maximum(overlay, trail, out=overlay)
+
+        # Draw current position with pulse effect, quantized to the
+        # nearest pre-rendered pulse sprite
+        current_x = int(coords[-1, 0] * self.render_scale)
+        current_y = int(coords[-1, 1] * self.render_scale)
+        phase_idx = int(self.pulse_phase * (32 / (2 * np.pi))) & 31
+        sprite = self._pulse_sprites[self._phase_to_sprite[phase_idx]]
+        self._paste(overlay, sprite, current_x, current_y)
+
+        # One SIMD upscale back to screen size
+        return cv2.resize(overlay, (self.screen_width, self.screen_height),
+                          dst=self._out, interpolation=cv2.INTER_LINEAR)
     
     def reset(self):
         """Clear the gaze trail."""
-        self.gaze_trail.clear()
+        self._trail_head = 0
+        self._trail_n = 0
         self.pulse_phase = 0